@@ -6,11 +6,140 @@
 # Description: EU ETS switching price calculation and BI-ready exports
 # =====================================================================
 
-import pandas as pd
-import numpy as np
+import os
+import re
+from functools import lru_cache
+
+# pandas and numpy are imported lazily inside the functions that need them —
+# a Streamlit Cloud worker that only needs the pure-Python classification
+# helpers then skips their import cost on every cold start
+
+# Compiled keyword alternations for metric classification (built once at import,
+# so the BI-export path can dispatch whole columns without per-row Python calls)
+_ECONOMIC_RE = re.compile(r'price|cost|revenue|surplus|eur', re.IGNORECASE)
+_ENVIRONMENTAL_RE = re.compile(r'emissions|carbon|intensity|co2|renewable', re.IGNORECASE)
+_TECHNICAL_RE = re.compile(r'generation|demand|capacity|mw|curtailment|avail', re.IGNORECASE)
+
+# Ordered (pattern, unit) rules, most specific keyword first — generic
+# keywords like 'eur' or 'mw' must not shadow 'carbon_price' or 'price'
+_UNIT_RULES = (
+    (re.compile(r'carbon_price', re.IGNORECASE), '€/ton'),
+    (re.compile(r'price', re.IGNORECASE), '€/MWh'),
+    (re.compile(r'intensity', re.IGNORECASE), 't/MWh or g/kWh'),
+    (re.compile(r'emissions', re.IGNORECASE), 'tons CO₂'),
+    (re.compile(r'curtailment', re.IGNORECASE), 'MW'),
+    (re.compile(r'capacity', re.IGNORECASE), 'MW'),
+    (re.compile(r'generation', re.IGNORECASE), 'MW'),
+    (re.compile(r'demand', re.IGNORECASE), 'MW'),
+    (re.compile(r'avail', re.IGNORECASE), '%'),
+    (re.compile(r'share', re.IGNORECASE), '%'),
+    (re.compile(r'revenue', re.IGNORECASE), '€'),
+    (re.compile(r'surplus', re.IGNORECASE), '€'),
+    (re.compile(r'cost', re.IGNORECASE), '€'),
+    (re.compile(r'mw', re.IGNORECASE), 'MW'),
+    (re.compile(r'eur', re.IGNORECASE), '€'),
+)
 
 # ===== SECTION 1: EMISSIONS SWITCHING PRICE CALCULATION =====
 
+# Optional numba JIT for the fuel-cost aggregation — worthwhile once the plant
+# table grows to pan-EU registry size; the NumPy fallback keeps the module
+# dependency-free
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+if njit is not None:
+    @njit(cache=True)
+    def _group_fuel_sums(codes, fuel):
+        """Sum fuel costs and counts for coal (code 0) and gas (code 1) in one pass"""
+        coal_sum = 0.0
+        gas_sum = 0.0
+        coal_count = 0
+        gas_count = 0
+        for i in range(codes.size):
+            code = codes[i]
+            if code == 0:
+                coal_sum += fuel[i]
+                coal_count += 1
+            elif code == 1:
+                gas_sum += fuel[i]
+                gas_count += 1
+        return coal_sum, coal_count, gas_sum, gas_count
+else:
+    def _group_fuel_sums(codes, fuel):
+        """NumPy fallback: same group sums/counts without the JIT"""
+        coal_mask = codes == 0
+        gas_mask = codes == 1
+        return (fuel[coal_mask].sum(), int(coal_mask.sum()),
+                fuel[gas_mask].sum(), int(gas_mask.sum()))
+
+
+def _mean_fuel_costs(plants_df):
+    """
+    Average coal and gas fuel costs from the plant table in a single pass
+    over int8 group codes — no intermediate sub-DataFrames, JIT-compiled
+    when numba is present
+    """
+    import numpy as np
+
+    codes = (
+        plants_df['Technology']
+        .map({'Coal': 0, 'Gas': 1, 'Gas Peaker': 1})
+        .fillna(-1)
+        .astype(np.int8)
+        .to_numpy()
+    )
+    fuel = plants_df['Fuel_Cost_EUR_MWh'].to_numpy(np.float64)
+    coal_sum, coal_count, gas_sum, gas_count = _group_fuel_sums(codes, fuel)
+
+    if coal_count == 0:
+        raise ValueError("No coal plants found in database")
+    if gas_count == 0:
+        raise ValueError("No gas plants found in database")
+
+    return coal_sum / coal_count, gas_sum / gas_count
+
+
+@lru_cache(maxsize=128)
+def _switching_price_math(coal_fuel_cost, gas_fuel_cost, coal_efficiency,
+                          gas_efficiency, coal_emission_factor, gas_emission_factor):
+    """
+    Pure numeric core of the switching-price formula, memoized on its inputs
+
+    Scenario sweeps call calculate_switching_price repeatedly with the same
+    plant fleet and default factors; after the first call the derived numbers
+    come straight from the cache.
+    """
+    # Generation costs per MWh (fuel cost / efficiency)
+    coal_gen_cost = coal_fuel_cost / coal_efficiency  # €/MWh_electric
+    gas_gen_cost = gas_fuel_cost / gas_efficiency     # €/MWh_electric
+
+    # Emission rates per MWh_electric
+    coal_emission_rate = coal_emission_factor / coal_efficiency  # tCO2/MWh_electric
+    gas_emission_rate = gas_emission_factor / gas_efficiency    # tCO2/MWh_electric
+
+    # Switching price formula
+    # At switching price: Coal_SRMC = Gas_SRMC
+    # Coal_Fuel/Eff + Carbon*Coal_Emission/Eff = Gas_Fuel/Eff + Carbon*Gas_Emission/Eff
+    # Solving for Carbon price:
+    numerator = gas_gen_cost - coal_gen_cost
+    denominator = coal_emission_rate - gas_emission_rate
+
+    if denominator <= 0:
+        raise ValueError("Invalid emission factors: Gas must have lower emissions than coal")
+
+    switching_price = numerator / denominator
+
+    # Costs at switching point
+    coal_cost_at_switch = coal_gen_cost + (switching_price * coal_emission_rate)
+    gas_cost_at_switch = gas_gen_cost + (switching_price * gas_emission_rate)
+
+    return (switching_price, coal_gen_cost, gas_gen_cost, coal_emission_rate,
+            gas_emission_rate, coal_cost_at_switch, gas_cost_at_switch)
+
+
 def calculate_switching_price(plants_df, coal_efficiency=0.38, gas_efficiency=0.55,
                               coal_emission_factor=0.34, gas_emission_factor=0.20):
     """
@@ -46,44 +175,77 @@ def calculate_switching_price(plants_df, coal_efficiency=0.38, gas_efficiency=0.
         - gas_marginal_cost: Gas generation cost at switching point
     """
     
-    # Extract fuel costs
-    coal_plants = plants_df[plants_df['Technology'] == 'Coal']
-    gas_plants = plants_df[plants_df['Technology'].isin(['Gas', 'Gas Peaker'])]
-    
-    # Calculate average fuel costs
-    if len(coal_plants) == 0:
-        raise ValueError("No coal plants found in database")
-    if len(gas_plants) == 0:
-        raise ValueError("No gas plants found in database")
-    
-    coal_fuel_cost = coal_plants['Fuel_Cost_EUR_MWh'].mean()
-    gas_fuel_cost = gas_plants['Fuel_Cost_EUR_MWh'].mean()
-    
-    # Calculate generation costs per MWh (fuel cost / efficiency)
-    coal_gen_cost = coal_fuel_cost / coal_efficiency  # €/MWh_electric
-    gas_gen_cost = gas_fuel_cost / gas_efficiency     # €/MWh_electric
-    
-    # Calculate emission rates per MWh_electric
-    coal_emission_rate = coal_emission_factor / coal_efficiency  # tCO2/MWh_electric
-    gas_emission_rate = gas_emission_factor / gas_efficiency    # tCO2/MWh_electric
-    
-    # Switching price formula
-    # At switching price: Coal_SRMC = Gas_SRMC
-    # Coal_Fuel/Eff + Carbon*Coal_Emission/Eff = Gas_Fuel/Eff + Carbon*Gas_Emission/Eff
-    # Solving for Carbon price:
-    numerator = gas_gen_cost - coal_gen_cost
+    coal_fuel_cost, gas_fuel_cost = _mean_fuel_costs(plants_df)
+
+    # All derived numbers come from the cached numeric core
+    (switching_price, coal_gen_cost, gas_gen_cost, coal_emission_rate,
+     gas_emission_rate, coal_cost_at_switch, gas_cost_at_switch) = _switching_price_math(
+        coal_fuel_cost, gas_fuel_cost, coal_efficiency, gas_efficiency,
+        coal_emission_factor, gas_emission_factor
+    )
+
+    return {
+        'switching_price_eur_ton': switching_price,
+        'coal_fuel_cost_eur_mwh': coal_fuel_cost,
+        'gas_fuel_cost_eur_mwh': gas_fuel_cost,
+        'coal_generation_cost_eur_mwh': coal_gen_cost,
+        'gas_generation_cost_eur_mwh': gas_gen_cost,
+        'coal_emission_rate_t_mwh': coal_emission_rate,
+        'gas_emission_rate_t_mwh': gas_emission_rate,
+        'coal_srmc_at_switching_eur_mwh': coal_cost_at_switch,
+        'gas_srmc_at_switching_eur_mwh': gas_cost_at_switch,
+        'formula_validation': abs(coal_cost_at_switch - gas_cost_at_switch) < 0.01  # Should be ~equal
+    }
+
+
+def calculate_switching_price_batch(plants_df, coal_efficiencies=0.38, gas_efficiencies=0.55,
+                                    coal_emission_factors=0.34, gas_emission_factors=0.20):
+    """
+    Broadcast the switching-price formula across grids of plant parameters
+
+    Companion to calculate_switching_price() for sensitivity sweeps: the fuel
+    costs are aggregated once and the formula is evaluated for every parameter
+    combination in NumPy broadcasts instead of one Python call per point.
+
+    Parameters:
+    -----------
+    plants_df : DataFrame
+        Power plant database with columns: Technology, Fuel_Cost_EUR_MWh
+    coal_efficiencies, gas_efficiencies : float or array-like
+        Thermal efficiencies to sweep
+    coal_emission_factors, gas_emission_factors : float or array-like
+        CO2 emission factors (tCO2/MWh_thermal) to sweep
+
+    Returns:
+    --------
+    DataFrame : One row per (broadcast) parameter combination with the same
+        quantities as the scalar function's dict
+    """
+    import numpy as np
+    import pandas as pd
+
+    coal_fuel_cost, gas_fuel_cost = _mean_fuel_costs(plants_df)
+
+    coal_eff, gas_eff, coal_ef, gas_ef = np.broadcast_arrays(*(
+        np.atleast_1d(np.asarray(p, dtype=np.float64))
+        for p in (coal_efficiencies, gas_efficiencies,
+                  coal_emission_factors, gas_emission_factors)
+    ))
+
+    coal_gen_cost = coal_fuel_cost / coal_eff
+    gas_gen_cost = gas_fuel_cost / gas_eff
+    coal_emission_rate = coal_ef / coal_eff
+    gas_emission_rate = gas_ef / gas_eff
+
     denominator = coal_emission_rate - gas_emission_rate
-    
-    if denominator <= 0:
+    if np.any(denominator <= 0):
         raise ValueError("Invalid emission factors: Gas must have lower emissions than coal")
-    
-    switching_price = numerator / denominator
-    
-    # Calculate costs at switching point
+
+    switching_price = (gas_gen_cost - coal_gen_cost) / denominator
     coal_cost_at_switch = coal_gen_cost + (switching_price * coal_emission_rate)
     gas_cost_at_switch = gas_gen_cost + (switching_price * gas_emission_rate)
-    
-    return {
+
+    return pd.DataFrame({
         'switching_price_eur_ton': switching_price,
         'coal_fuel_cost_eur_mwh': coal_fuel_cost,
         'gas_fuel_cost_eur_mwh': gas_fuel_cost,
@@ -93,60 +255,253 @@ def calculate_switching_price(plants_df, coal_efficiency=0.38, gas_efficiency=0.
         'gas_emission_rate_t_mwh': gas_emission_rate,
         'coal_srmc_at_switching_eur_mwh': coal_cost_at_switch,
         'gas_srmc_at_switching_eur_mwh': gas_cost_at_switch,
-        'formula_validation': abs(coal_cost_at_switch - gas_cost_at_switch) < 0.01  # Should be ~equal
-    }
+        'formula_validation': np.abs(coal_cost_at_switch - gas_cost_at_switch) < 0.01
+    })
+
+
+# Regime details indexed by sign(carbon price - switching price) + 1,
+# i.e. position 0 = below, 1 = at, 2 = above the switching point
+_REGIMES = ('COAL-DOMINATED', 'TRANSITION ZONE', 'GAS-DOMINATED')
+_MARGINAL_TECHS = ('Coal', 'Coal/Gas (Indifferent)', 'Gas')
+_EXPLANATIONS = (
+    'Carbon price is below switching point. Coal plants are more economical than gas.',
+    'Carbon price is at switching point. Coal and gas have equal generation costs.',
+    'Carbon price is above switching point. Gas plants are more economical than coal.',
+)
+
+
+def interpret_switching_price_vec(carbon_prices, switching_price_data):
+    """
+    Interpret a whole grid of carbon prices against the switching price
+
+    Vectorized companion to interpret_switching_price(): regime, price
+    distance and percentage are computed in a single NumPy pass instead of
+    calling the scalar function once per price.
+
+    Parameters:
+    -----------
+    carbon_prices : array-like
+        EU ETS carbon prices to interpret (€/ton)
+    switching_price_data : dict
+        Output from calculate_switching_price()
+
+    Returns:
+    --------
+    DataFrame : One row per carbon price with market regime and price distances
+    """
+    import numpy as np
+    import pandas as pd
+
+    switching_price = switching_price_data['switching_price_eur_ton']
+    cp = np.asarray(carbon_prices, dtype=np.float64)
+
+    price_difference = cp - switching_price
+    percentage_difference = (price_difference / switching_price) * 100
+    regime = np.select(
+        [price_difference < 0, price_difference > 0],
+        np.array(['COAL-DOMINATED', 'GAS-DOMINATED']),
+        default='TRANSITION ZONE'
+    )
+
+    return pd.DataFrame({
+        'market_regime': pd.Categorical(regime),
+        'carbon_price_vs_switching': price_difference,
+        'percentage_above_below_switching': percentage_difference,
+        'switching_price': switching_price,
+        'current_carbon_price': cp,
+        'is_coal_cheaper': price_difference < 0,
+        'is_gas_cheaper': price_difference > 0
+    })
 
 
 def interpret_switching_price(current_carbon_price, switching_price_data):
     """
     Interpret the switching price result and provide market insights
-    
+
     Parameters:
     -----------
     current_carbon_price : float
         Current EU ETS carbon price (€/ton)
     switching_price_data : dict
         Output from calculate_switching_price()
-    
+
     Returns:
     --------
     dict : Market interpretation with key insights
     """
     switching_price = switching_price_data['switching_price_eur_ton']
-    
-    # Determine market regime
-    if current_carbon_price < switching_price:
-        regime = "COAL-DOMINATED"
-        marginal_tech = "Coal"
-        explanation = "Carbon price is below switching point. Coal plants are more economical than gas."
-    elif current_carbon_price > switching_price:
-        regime = "GAS-DOMINATED"
-        marginal_tech = "Gas"
-        explanation = "Carbon price is above switching point. Gas plants are more economical than coal."
-    else:
-        regime = "TRANSITION ZONE"
-        marginal_tech = "Coal/Gas (Indifferent)"
-        explanation = "Carbon price is at switching point. Coal and gas have equal generation costs."
-    
-    # Calculate how far from switching point
+
+    # Branchless regime dispatch: sign is -1 below, 0 at, +1 above the
+    # switching point, and indexes straight into the regime tuples
+    sign = int(current_carbon_price > switching_price) - int(current_carbon_price < switching_price)
+
     price_difference = current_carbon_price - switching_price
     percentage_difference = (price_difference / switching_price) * 100
-    
+
     return {
-        'market_regime': regime,
-        'marginal_technology': marginal_tech,
-        'explanation': explanation,
+        'market_regime': _REGIMES[sign + 1],
+        'marginal_technology': _MARGINAL_TECHS[sign + 1],
+        'explanation': _EXPLANATIONS[sign + 1],
         'carbon_price_vs_switching': price_difference,
         'percentage_above_below_switching': percentage_difference,
         'switching_price': switching_price,
         'current_carbon_price': current_carbon_price,
-        'is_coal_cheaper': current_carbon_price < switching_price,
-        'is_gas_cheaper': current_carbon_price > switching_price
+        'is_coal_cheaper': sign < 0,
+        'is_gas_cheaper': sign > 0
     }
 
 
 # ===== SECTION 2: BI-READY DATA EXPORT =====
 
+def _split_summary_columns(summary_df):
+    """Split summary columns into identifier columns and numeric KPI value columns"""
+    import pandas as pd
+
+    id_columns = ['Scenario_Name']
+
+    # Add optional identifier columns if they exist
+    optional_ids = ['Period_Type', 'Season', 'Demand_MW', 'Carbon_Price_EUR_ton',
+                   'Wind_Avail_%', 'Solar_Avail_%']
+
+    for col in optional_ids:
+        if col in summary_df.columns:
+            id_columns.append(col)
+
+    # Value columns are the remaining numeric metrics; non-numeric leftovers
+    # (e.g. Marginal_Technology, Market_Regime) become identifiers too — a
+    # single string column in value_vars would upcast the whole melted Value
+    # column to object
+    value_columns = []
+    for col in summary_df.columns:
+        if col in id_columns:
+            continue
+        dtype = summary_df[col].dtype
+        if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+            value_columns.append(col)
+        else:
+            id_columns.append(col)
+
+    return id_columns, value_columns
+
+
+def _build_metric_metadata(value_columns):
+    """Build the small KPI_Metric -> (Data_Type, Unit) metadata frame"""
+    import pandas as pd
+
+    return pd.DataFrame({
+        'KPI_Metric': value_columns,
+        'Data_Type': [classify_metric_type(col) for col in value_columns],
+        'Unit': [get_metric_unit(col) for col in value_columns],
+    })
+
+
+def prepare_bi_export_parquet(summary_df, path):
+    """
+    Write the wide-format scenario summary as a BI-ready Parquet file
+
+    Power BI and Tableau ingest wide Parquet natively, so the data stays wide
+    (one row per scenario) instead of being exploded into scenarios × metrics
+    rows by a melt. The metric classification is written as a small
+    'metrics_metadata' sidecar table (KPI_Metric, Data_Type, Unit) next to the
+    main file, which the BI tool can join at query time.
+
+    Parameters:
+    -----------
+    summary_df : DataFrame
+        Wide-format summary with scenarios as rows and metrics as columns
+    path : str
+        Destination path for the Parquet file (e.g. 'Outputs/bi_ready_export.parquet')
+
+    Returns:
+    --------
+    tuple : (path to summary Parquet, path to metrics metadata Parquet)
+    """
+    import numpy as np
+    import pandas as pd
+
+    id_columns, value_columns = _split_summary_columns(summary_df)
+
+    # Compact dtypes: dictionary-encode string identifiers, halve float metrics
+    casts = {}
+    for col in id_columns:
+        if summary_df[col].dtype == object:
+            casts[col] = 'category'
+    for col in value_columns:
+        if pd.api.types.is_float_dtype(summary_df[col]):
+            casts[col] = np.float32
+    df = summary_df.astype(casts)
+
+    df.to_parquet(path, engine='pyarrow', compression='zstd', index=False)
+
+    # Sidecar with one row per metric (join key: KPI_Metric)
+    meta = _build_metric_metadata(value_columns)
+    meta_path = os.path.splitext(path)[0] + '_metrics_metadata.parquet'
+    meta.to_parquet(meta_path, engine='pyarrow', compression='zstd', index=False)
+
+    return path, meta_path
+
+
+def prepare_bi_export_arrow(summary_df):
+    """
+    Build the long-format BI table directly as a PyArrow Table
+
+    Same layout as prepare_bi_export() but without pandas' melt, which tiles
+    the identifier columns and concatenates the value columns into fresh
+    ndarrays. Here each identifier becomes a dictionary-encoded array over the
+    original N row values (the tile collapses to an int32 index vector), the
+    metric/Data_Type/Unit columns are dictionary arrays over the M metric
+    names, and Value is a single concatenation of float32 chunks.
+
+    Parameters:
+    -----------
+    summary_df : DataFrame
+        Wide-format summary with scenarios as rows and metrics as columns
+
+    Returns:
+    --------
+    pyarrow.Table : Long-format table — call .to_pandas() for a DataFrame or
+        hand it to pyarrow.parquet.write_table() directly
+    """
+    import numpy as np
+    import pandas as pd
+    import pyarrow as pa
+
+    id_columns, value_columns = _split_summary_columns(summary_df)
+    n_rows = len(summary_df)
+    n_metrics = len(value_columns)
+
+    # Metric index repeated once per row — value_columns are already unique
+    metric_indices = pa.array(np.repeat(np.arange(n_metrics, dtype=np.int32), n_rows))
+
+    # Identifier values repeat across rows (Season, Period_Type, ...), so
+    # factorize first: the dictionary holds unique values and the tiled codes
+    # index into it per long row
+    columns = {}
+    for col in id_columns:
+        codes, uniques = pd.factorize(summary_df[col].to_numpy())
+        columns[col] = pa.DictionaryArray.from_arrays(
+            pa.array(np.tile(codes.astype(np.int32), n_metrics)), pa.array(uniques)
+        )
+
+    columns['KPI_Metric'] = pa.DictionaryArray.from_arrays(
+        metric_indices, pa.array(value_columns)
+    )
+    columns['Value'] = pa.concat_arrays([
+        pa.array(summary_df[col].to_numpy(np.float32)) for col in value_columns
+    ])
+
+    # Metric metadata: values repeat across metrics too, so factorize the
+    # M-entry lists the same way before repeating per row
+    meta = _build_metric_metadata(value_columns)
+    for name in ('Data_Type', 'Unit'):
+        codes, uniques = pd.factorize(meta[name].to_numpy())
+        columns[name] = pa.DictionaryArray.from_arrays(
+            pa.array(np.repeat(codes.astype(np.int32), n_rows)), pa.array(uniques)
+        )
+
+    return pa.table(columns)
+
+
 def prepare_bi_export(summary_df):
     """
     Transform wide-format scenario summary into long-format for Power BI / Tableau
@@ -173,40 +528,60 @@ def prepare_bi_export(summary_df):
     DataFrame : Long-format data optimized for BI tools
     """
     
-    # Make a copy to avoid modifying original
-    df = summary_df.copy()
-    
-    # Define identifier columns (will be preserved during melt)
-    id_columns = ['Scenario_Name']
-    
-    # Add optional identifier columns if they exist
-    optional_ids = ['Period_Type', 'Season', 'Demand_MW', 'Carbon_Price_EUR_ton', 
-                   'Wind_Avail_%', 'Solar_Avail_%']
-    
-    for col in optional_ids:
-        if col in df.columns:
-            id_columns.append(col)
-    
-    # Define value columns (metrics to melt)
-    # These are all columns except the identifiers
-    value_columns = [col for col in df.columns if col not in id_columns]
-    
+    import numpy as np
+    import pandas as pd
+
+    # No defensive copy needed — melt never mutates its input, and the
+    # category casts below happen on the melted output
+    id_columns, value_columns = _split_summary_columns(summary_df)
+
+    # Downcast float metrics to float32 before the melt — KPI precision is far
+    # below 1%, and this halves the bytes moved by the melt and the final sort
+    float_casts = {
+        col: np.float32 for col in value_columns
+        if pd.api.types.is_float_dtype(summary_df[col])
+    }
+    if float_casts:
+        summary_df = summary_df.astype(float_casts)
+
+    # Classify metrics on the column names only — the melted frame repeats each
+    # metric once per scenario, so classifying there would redo the same string
+    # work N_scenarios times
+    meta = _build_metric_metadata(value_columns)
+
     # Melt the dataframe
     bi_ready_df = pd.melt(
-        df,
+        summary_df,
         id_vars=id_columns,
         value_vars=value_columns,
         var_name='KPI_Metric',
         value_name='Value'
     )
-    
-    # Add metadata columns for better BI filtering
-    bi_ready_df['Data_Type'] = bi_ready_df['KPI_Metric'].apply(classify_metric_type)
-    bi_ready_df['Unit'] = bi_ready_df['KPI_Metric'].apply(get_metric_unit)
-    
-    # Sort for better readability
-    bi_ready_df = bi_ready_df.sort_values(['Scenario_Name', 'KPI_Metric']).reset_index(drop=True)
-    
+
+    # value_vars are numeric-only, so Value must stay numeric for the
+    # downstream NumPy paths
+    assert bi_ready_df['Value'].dtype.kind in 'if', bi_ready_df['Value'].dtype
+
+    # Categorical keys make the final sort an integer-code sort and avoid
+    # repeating each Python string once per metric in the long frame
+    bi_ready_df['Scenario_Name'] = bi_ready_df['Scenario_Name'].astype('category')
+
+    # Add metadata columns for better BI filtering (dictionary-encoded join)
+    bi_ready_df['KPI_Metric'] = bi_ready_df['KPI_Metric'].astype('category')
+    meta['KPI_Metric'] = meta['KPI_Metric'].astype(bi_ready_df['KPI_Metric'].dtype)
+    bi_ready_df = bi_ready_df.merge(meta, on='KPI_Metric', how='left')
+    
+    # Sort for better readability — both keys are categorical, so fold their
+    # integer codes into one composite key and argsort that instead of
+    # lexsorting two columns
+    if len(bi_ready_df):
+        scenario_codes = bi_ready_df['Scenario_Name'].cat.codes.to_numpy(np.int64)
+        metric_codes = bi_ready_df['KPI_Metric'].cat.codes.to_numpy(np.int64)
+        composite_key = scenario_codes * (metric_codes.max() + 1) + metric_codes
+        order = np.argsort(composite_key, kind='stable')
+        bi_ready_df = bi_ready_df.take(order)
+        bi_ready_df.reset_index(drop=True, inplace=True)
+
     return bi_ready_df
 
 
@@ -223,17 +598,13 @@ def classify_metric_type(metric_name):
     --------
     str : Category (Economic, Environmental, Technical, or Other)
     """
-    economic_keywords = ['Price', 'Cost', 'Revenue', 'Surplus', 'EUR']
-    environmental_keywords = ['Emissions', 'Carbon', 'Intensity', 'CO2', 'Renewable']
-    technical_keywords = ['Generation', 'Demand', 'Capacity', 'MW', 'Curtailment', 'Avail']
-    
-    metric_lower = metric_name.lower()
-    
-    if any(keyword.lower() in metric_lower for keyword in economic_keywords):
+    # Keyword tables are compiled once at module scope as case-insensitive
+    # regex alternations, so each call is a single C-level scan per category
+    if _ECONOMIC_RE.search(metric_name):
         return 'Economic'
-    elif any(keyword.lower() in metric_lower for keyword in environmental_keywords):
+    elif _ENVIRONMENTAL_RE.search(metric_name):
         return 'Environmental'
-    elif any(keyword.lower() in metric_lower for keyword in technical_keywords):
+    elif _TECHNICAL_RE.search(metric_name):
         return 'Technical'
     else:
         return 'Other'
@@ -252,32 +623,11 @@ def get_metric_unit(metric_name):
     --------
     str : Unit of measurement
     """
-    metric_lower = metric_name.lower()
-    
-    # Define unit mappings
-    unit_mappings = {
-        'eur': '€',
-        'price': '€/MWh',
-        'cost': '€',
-        'revenue': '€',
-        'surplus': '€',
-        'mw': 'MW',
-        'demand': 'MW',
-        'generation': 'MW',
-        'capacity': 'MW',
-        'emissions': 'tons CO₂',
-        'intensity': 't/MWh or g/kWh',
-        'share': '%',
-        'avail': '%',
-        'curtailment': 'MW',
-        'carbon_price': '€/ton'
-    }
-    
-    # Check for matches
-    for keyword, unit in unit_mappings.items():
-        if keyword in metric_lower:
+    # Scan the precompiled (pattern, unit) rules, first match wins
+    for pattern, unit in _UNIT_RULES:
+        if pattern.search(metric_name):
             return unit
-    
+
     return '-'  # No unit identified
 
 
@@ -298,7 +648,9 @@ def add_switching_analysis_to_summary(summary_df, plants_df):
     --------
     DataFrame : Summary with additional switching price columns
     """
-    
+    import numpy as np
+    import pandas as pd
+
     # Calculate switching price once (same for all scenarios)
     try:
         switching_data = calculate_switching_price(plants_df)
@@ -307,27 +659,25 @@ def add_switching_analysis_to_summary(summary_df, plants_df):
         print(f"⚠️  Warning: Could not calculate switching price - {str(e)}")
         return summary_df
     
-    # Add switching price column
-    summary_df['Switching_Price_EUR_ton'] = switching_price
-    
-    # Add market regime column
-    summary_df['Market_Regime'] = summary_df['Carbon_Price_EUR_ton'].apply(
-        lambda cp: 'COAL-DOMINATED' if cp < switching_price 
-        else 'GAS-DOMINATED' if cp > switching_price 
-        else 'TRANSITION'
-    )
-    
-    # Add distance from switching point
-    summary_df['Carbon_Price_vs_Switching_EUR'] = (
-        summary_df['Carbon_Price_EUR_ton'] - switching_price
-    )
-    
-    # Add percentage difference
-    summary_df['Carbon_Price_vs_Switching_%'] = (
-        (summary_df['Carbon_Price_vs_Switching_EUR'] / switching_price) * 100
-    )
-    
-    return summary_df
+    # Compute all new columns up front (vectorized: one np.select instead of a
+    # per-row apply, and the distance is computed once and reused for the %)
+    cp = summary_df['Carbon_Price_EUR_ton'].to_numpy()
+    regime_conditions = [cp < switching_price, cp > switching_price]
+    regime_choices = np.array(['COAL-DOMINATED', 'GAS-DOMINATED'])
+    price_diff = cp - switching_price
+
+    # Attach them in a single concat rather than four sequential column
+    # insertions, which each churn the BlockManager on a wide summary
+    extra_columns = pd.DataFrame({
+        'Switching_Price_EUR_ton': switching_price,
+        'Market_Regime': pd.Categorical(
+            np.select(regime_conditions, regime_choices, default='TRANSITION')
+        ),
+        'Carbon_Price_vs_Switching_EUR': price_diff,
+        'Carbon_Price_vs_Switching_%': (price_diff / switching_price) * 100,
+    }, index=summary_df.index)
+
+    return pd.concat([summary_df, extra_columns], axis=1)
 
 
 # ===== SECTION 4: VALIDATION & TESTING =====
@@ -338,6 +688,8 @@ def validate_switching_price_calculation():
     
     This is a self-contained validation function
     """
+    import pandas as pd
+
     print("\n" + "="*70)
     print("🧪 VALIDATING SWITCHING PRICE CALCULATION")
     print("="*70)
@@ -9,6 +9,10 @@ import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 import numpy as np
+import concurrent.futures
+import hashlib
+import io
+import json
 import os
 import sys
 from PIL import Image
@@ -114,10 +118,20 @@ def show_diagnostic_info():
 
 # ===== CACHED DATA LOADING WITH ERROR HANDLING =====
 
+@st.cache_resource
+def _warmup_engine():
+    """Compile/prime the analysis kernels once per server process, so the
+    first scenario run a user triggers doesn't pay the one-off cost"""
+    try:
+        return pma.warmup()
+    except Exception:
+        return False
+
 @st.cache_data
 def load_data():
     """Load plant and scenario data with comprehensive error handling"""
     try:
+        _warmup_engine()
         plants = pma.load_plant_database()
         scenarios = pma.load_scenarios()
        
@@ -142,8 +156,10 @@ def load_data():
             show_diagnostic_info()
             return None, None
         
-        return plants, scenarios
-        
+        # Index scenarios by name (keeping the column) so per-rerun lookups
+        # are hash-based instead of a boolean scan of the whole frame
+        return plants, scenarios.set_index('Scenario_Name', drop=False)
+
     except Exception as e:
         st.error(f"❌ Unexpected error during data loading: {str(e)}")
         st.write("**Error details:**")
@@ -151,27 +167,135 @@ def load_data():
         show_diagnostic_info()
         return None, None
 
+# Disk-backed result cache: survives server restarts and cache evictions,
+# keyed on a content hash of the two input CSVs
+_RESULTS_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+
+def _inputs_key(plants_df, scenarios_df):
+    """Content hash of the input frames, used as the on-disk cache key"""
+    return hashlib.md5(
+        pd.util.hash_pandas_object(plants_df, index=False).values.tobytes()
+        + pd.util.hash_pandas_object(scenarios_df, index=False).values.tobytes()
+    ).hexdigest()
+
+def _save_results_to_disk(key, all_results, summary_df):
+    """Persist scenario results as Parquet + a JSON scalar sidecar"""
+    try:
+        cache_dir = os.path.join(_RESULTS_CACHE_DIR, key)
+        os.makedirs(cache_dir, exist_ok=True)
+        summary_df.to_parquet(os.path.join(cache_dir, 'summary.parquet'))
+        scalars = []
+        for i, result in enumerate(all_results):
+            result['dispatch_df'].to_parquet(os.path.join(cache_dir, f'dispatch_{i}.parquet'))
+            scalars.append({k: v for k, v in result.items() if k != 'dispatch_df'})
+        with open(os.path.join(cache_dir, 'results.json'), 'w') as fh:
+            json.dump(scalars, fh, default=lambda o: o.item() if hasattr(o, 'item') else str(o))
+    except Exception:
+        # Persistence is best-effort; the in-memory cache still works
+        pass
+
+def _load_results_from_disk(key):
+    """Rebuild (all_results, summary_df) from a previous run, or None"""
+    cache_dir = os.path.join(_RESULTS_CACHE_DIR, key)
+    try:
+        with open(os.path.join(cache_dir, 'results.json')) as fh:
+            scalars = json.load(fh)
+        all_results = []
+        for i, result in enumerate(scalars):
+            result['dispatch_df'] = pd.read_parquet(os.path.join(cache_dir, f'dispatch_{i}.parquet'))
+            all_results.append(result)
+        summary_df = pd.read_parquet(os.path.join(cache_dir, 'summary.parquet'))
+        return all_results, summary_df
+    except Exception:
+        return None
+
 @st.cache_data
 def run_all_scenarios_cached(_plants_df, _scenarios_df):
-    """Run all scenarios and cache results"""
+    """Run all scenarios and cache results (in memory and on disk)"""
     try:
+        key = _inputs_key(_plants_df, _scenarios_df)
+        cached = _load_results_from_disk(key)
+        if cached is not None:
+            return cached
         all_results = pma.run_all_scenarios(_plants_df, _scenarios_df)
         summary_df = pma.create_summary_dataframe(all_results)
+        _save_results_to_disk(key, all_results, summary_df)
         return all_results, summary_df
     except Exception as e:
         st.error(f"Error running scenarios: {str(e)}")
         return None, None
 
-@st.cache_data
-def generate_all_charts(_all_results, _summary_df, _plants_df):
-    """Generate matplotlib charts once"""
+@st.cache_resource
+def _results_by_name(results_key, _all_results):
+    """Index scenario results by name once, so reruns do O(1) lookups"""
+    return {r['scenario_name']: r for r in _all_results}
+
+@st.cache_resource
+def _chart_prewarm(results_key, _all_results, _summary_df, _plants_df):
+    """Kick off matplotlib chart rendering in a background thread once per
+    result set, so the slowest step never blocks a rerun"""
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    return executor.submit(pma.create_all_visualizations, _all_results, _summary_df, _plants_df)
+
+
+@st.cache_data(ttl=60)
+def _chart_files(charts_path):
+    """Snapshot of chart filenames — one directory read instead of an
+    os.path.exists call per image, refreshed at most once a minute"""
     try:
-        pma.create_all_visualizations(_all_results, _summary_df, _plants_df)
-        return True
-    except Exception as e:
-        st.error(f"Error generating charts: {str(e)}")
-        return False
-    
+        return frozenset(entry.name for entry in os.scandir(charts_path))
+    except OSError:
+        return frozenset()
+
+@st.cache_data
+def _csv_bytes(df_hash, _df):
+    """Serialize a DataFrame to CSV bytes once per content hash, so the
+    download buttons skip both the serialization and a str→bytes copy"""
+    buf = io.BytesIO()
+    _df.to_csv(buf, index=False)
+    return buf.getvalue()
+
+@st.cache_data
+def _summary_insights(df_hash, _df):
+    """Compute the Data-Explorer headline stats in one agg pass and cache
+    them, instead of six separate column scans per rerun"""
+    stats = _df.agg({
+        'Market_Price_EUR_MWh': ['min', 'max', 'mean', 'idxmin', 'idxmax'],
+        'Renewable_Share_%': ['mean', 'max'],
+        'Total_Emissions_tons': ['sum'],
+    })
+    price = stats['Market_Price_EUR_MWh']
+    return {
+        'min_price': price['min'],
+        'max_price': price['max'],
+        'avg_price': price['mean'],
+        'min_scenario': _df.loc[price['idxmin'], 'Scenario_Name'],
+        'max_scenario': _df.loc[price['idxmax'], 'Scenario_Name'],
+        'avg_renewable': stats.loc['mean', 'Renewable_Share_%'],
+        'max_renewable': stats.loc['max', 'Renewable_Share_%'],
+        'total_emissions': stats.loc['sum', 'Total_Emissions_tons'],
+        'n_full_renewable': int((_df['Renewable_Share_%'] == 100).sum()),
+    }
+
+@st.cache_resource
+def _styled_summary(df_hash, _df):
+    """Build the formatted Styler once per content hash — the per-cell
+    formatter dispatch is pure Python and needn't rerun on every toggle"""
+    return _df.style.format({
+        'Market_Price_EUR_MWh': '€{:.2f}',
+        'Renewable_Share_%': '{:.1f}%',
+        'Total_Emissions_tons': '{:,.0f}',
+        'Carbon_Intensity_g_kWh': '{:.1f}',
+        'Producer_Surplus_EUR': '€{:,.0f}'
+    })
+
+@st.cache_data(max_entries=64)
+def _load_png(path):
+    """Read a chart PNG once; Streamlit keeps the bytes (and the encoded
+    payload it serves to the browser) across reruns"""
+    with open(path, 'rb') as fh:
+        return fh.read()
+
 @st.cache_data
 def calculate_switching_price_cached(_plants_df):
     """Calculate switching price once and cache it"""
@@ -184,50 +308,151 @@ def calculate_switching_price_cached(_plants_df):
     
 # ===== INTERACTIVE PLOTLY CHARTS =====
 
+# Above this many dispatched plants the merit-order segments are downsampled
+# before being sent to the browser — far beyond what a step curve can resolve
+# visually anyway
+_MAX_MERIT_SEGMENTS = 2000
+
+# Shared technology→color palette for all Plotly charts; built once at import
+# instead of per call
+COLOR_MAP = {
+    'Wind': '#3498db', 'Solar': '#f39c12', 'Hydro': '#1abc9c',
+    'Gas': '#e74c3c', 'Coal': '#34495e', 'Gas Peaker': '#c0392b',
+    'Biomass': '#27ae60'
+}
+_DEFAULT_COLOR = '#95a5a6'
+
+
+def _lttb_select(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling: pick the n_out visually most
+    significant points of (x, y) and return their sorted indices
+    """
+    n = x.size
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0] = 0
+    keep[-1] = n - 1
+
+    # Bucket edges over the interior points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+
+    prev = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+
+        # Average of the following bucket (the last bucket looks at the end point)
+        if i < n_out - 3:
+            next_lo, next_hi = edges[i + 1], edges[i + 2]
+        else:
+            next_lo, next_hi = n - 1, n
+        avg_x = x[next_lo:next_hi].mean()
+        avg_y = y[next_lo:next_hi].mean()
+
+        # Largest triangle between the previously kept point, each candidate,
+        # and the next bucket's average
+        area = np.abs(
+            (x[prev] - avg_x) * (y[lo:hi] - y[prev])
+            - (x[prev] - x[lo:hi]) * (avg_y - y[prev])
+        )
+        prev = lo + int(np.argmax(area))
+        keep[i + 1] = prev
+
+    return keep
+
+
+def _dispatch_hash(dispatch_df):
+    """Stable content hash of a dispatch DataFrame, used as a figure cache key"""
+    return hashlib.md5(pd.util.hash_pandas_object(dispatch_df, index=True).values).hexdigest()
+
+
+@st.cache_resource(max_entries=32)
+def _cached_merit_fig(scenario_name, dispatch_hash, _dispatch_df, demand_mw, market_price):
+    """Reuse the merit-order figure across reruns (keyed on scenario + data hash)"""
+    return create_interactive_merit_order(_dispatch_df, demand_mw, market_price, scenario_name)
+
+
+@st.cache_resource(max_entries=32)
+def _cached_generation_mix_fig(scenario_name, result_hash, _results):
+    """Reuse the generation-mix figure across reruns (keyed on scenario + data hash)"""
+    return create_interactive_generation_mix(_results, scenario_name)
+
+
 def create_interactive_merit_order(dispatch_df, demand_mw, market_price, scenario_name):
     """Create interactive Plotly merit order curve"""
-    
-    dispatch_df = dispatch_df.copy()
-    dispatch_df['Cumulative_Start'] = dispatch_df['Available_Capacity_MW'].cumsum().shift(1).fillna(0)
-    dispatch_df['Cumulative_End'] = dispatch_df['Available_Capacity_MW'].cumsum()
-    
+
     fig = go.Figure()
-    
-    color_map = {
-        'Wind': '#3498db', 'Solar': '#f39c12', 'Hydro': '#1abc9c',
-        'Gas': '#e74c3c', 'Coal': '#34495e', 'Gas Peaker': '#c0392b',
-        'Biomass': '#27ae60'
-    }
-    
-    for idx, row in dispatch_df.iterrows():
-        if row['Is_Dispatched']:
-            color = color_map.get(row['Technology'], '#95a5a6')
-            
-            fig.add_trace(go.Scatter(
-                x=[row['Cumulative_Start'], row['Cumulative_End']],
-                y=[row['SRMC_EUR_MWh'], row['SRMC_EUR_MWh']],
-                mode='lines',
-                line=dict(color=color, width=3),
-                name=row['Technology'],
-                showlegend=False,
-                hovertemplate=f"<b>{row['Plant_Name']}</b><br>" +
-                             f"Technology: {row['Technology']}<br>" +
-                             f"SRMC: €{row['SRMC_EUR_MWh']:.2f}/MWh<br>" +
-                             f"Capacity: {row['Dispatched_Capacity_MW']:.0f} MW<br>" +
-                             "<extra></extra>"
-            ))
-            
-            if idx > 0:
-                prev_price = dispatch_df.iloc[idx-1]['SRMC_EUR_MWh']
-                fig.add_trace(go.Scatter(
-                    x=[row['Cumulative_Start'], row['Cumulative_Start']],
-                    y=[prev_price, row['SRMC_EUR_MWh']],
-                    mode='lines',
-                    line=dict(color=color, width=3),
-                    showlegend=False,
-                    hoverinfo='skip'
-                ))
-    
+
+    # One WebGL trace per technology (≤7) instead of two SVG traces per plant:
+    # each plant contributes a [riser, start, end, NaN] segment so Plotly draws
+    # all steps of a technology as a single gapped staircase
+    dispatched = dispatch_df.loc[dispatch_df['Is_Dispatched']]
+
+    # Cumulative positions as local ndarrays — one cumsum, with the segment
+    # starts derived by subtraction; no DataFrame copy, no shift/fillna pass
+    # (dispatched plants are the merit-order prefix, so the positions match)
+    available_cap = dispatched['Available_Capacity_MW'].to_numpy()
+    cum_end = np.cumsum(available_cap)
+    cum_start = cum_end - available_cap
+    srmc = dispatched['SRMC_EUR_MWh'].to_numpy()
+
+    # For very large fleets, keep only the visually significant segments so
+    # the browser payload stays bounded regardless of fleet size
+    if len(dispatched) > _MAX_MERIT_SEGMENTS:
+        keep = _lttb_select((cum_start + cum_end) / 2, srmc, _MAX_MERIT_SEGMENTS)
+        dispatched = dispatched.iloc[keep]
+        cum_start = cum_start[keep]
+        cum_end = cum_end[keep]
+        srmc = srmc[keep]
+
+    plant_names = dispatched['Plant_Name'].to_numpy()
+    dispatched_cap = dispatched['Dispatched_Capacity_MW'].to_numpy()
+
+    # Previous plant's price, for the vertical riser connecting each step to
+    # the one before it (the first plant rises from its own level)
+    prev_srmc = np.empty_like(srmc)
+    if srmc.size:
+        prev_srmc[0] = srmc[0]
+        prev_srmc[1:] = srmc[:-1]
+
+    for tech, positions in dispatched.groupby('Technology', observed=True).indices.items():
+        n_plants = positions.size
+
+        xs = np.empty(4 * n_plants)
+        xs[0::4] = cum_start[positions]
+        xs[1::4] = cum_start[positions]
+        xs[2::4] = cum_end[positions]
+        xs[3::4] = np.nan
+
+        ys = np.empty(4 * n_plants)
+        ys[0::4] = prev_srmc[positions]
+        ys[1::4] = srmc[positions]
+        ys[2::4] = srmc[positions]
+        ys[3::4] = np.nan
+
+        # Per-point hover data (repeated for riser, segment ends and the gap)
+        customdata = np.repeat(
+            np.column_stack([plant_names[positions], srmc[positions], dispatched_cap[positions]]),
+            4, axis=0
+        )
+
+        fig.add_trace(go.Scattergl(
+            x=xs,
+            y=ys,
+            mode='lines',
+            line=dict(color=COLOR_MAP.get(tech, _DEFAULT_COLOR), width=3),
+            name=tech,
+            showlegend=False,
+            customdata=customdata,
+            hovertemplate="<b>%{customdata[0]}</b><br>" +
+                         f"Technology: {tech}<br>" +
+                         "SRMC: €%{customdata[1]:.2f}/MWh<br>" +
+                         "Capacity: %{customdata[2]:.0f} MW<br>" +
+                         "<extra></extra>"
+        ))
+
     fig.add_vline(x=demand_mw, line_dash="dash", line_color="red", line_width=2,
                   annotation_text=f"Demand: {demand_mw:,.0f} MW")
     fig.add_hline(y=market_price, line_dash="dash", line_color="purple", line_width=2,
@@ -240,7 +465,10 @@ def create_interactive_merit_order(dispatch_df, demand_mw, market_price, scenari
         hovermode='closest',
         height=600,
         showlegend=False,
-        plot_bgcolor='white'
+        plot_bgcolor='white',
+        # Constant across scenarios: the browser keeps zoom/pan state and the
+        # existing WebGL context instead of rebuilding it on every rerun
+        uirevision='merit-order'
     )
     
     return fig
@@ -252,12 +480,7 @@ def create_interactive_generation_mix(results, scenario_name):
     technologies = list(gen_by_tech.keys())
     generation = list(gen_by_tech.values())
     
-    color_map = {
-        'Wind': '#3498db', 'Solar': '#f39c12', 'Hydro': '#1abc9c',
-        'Gas': '#e74c3c', 'Coal': '#34495e', 'Gas Peaker': '#c0392b',
-        'Biomass': '#27ae60'
-    }
-    colors = [color_map.get(tech, '#95a5a6') for tech in technologies]
+    colors = pd.Series(technologies).map(COLOR_MAP).fillna(_DEFAULT_COLOR).tolist()
     
     fig = go.Figure(data=[go.Pie(
         labels=technologies,
@@ -267,7 +490,8 @@ def create_interactive_generation_mix(results, scenario_name):
         hovertemplate="<b>%{label}</b><br>Generation: %{value:,.0f} MW<br><extra></extra>"
     )])
     
-    fig.update_layout(title=f"Generation Mix - {scenario_name}", height=500)
+    fig.update_layout(title=f"Generation Mix - {scenario_name}", height=500,
+                      uirevision='generation-mix')
     
     return fig
 
@@ -413,10 +637,14 @@ Data/
     # Run analysis once
     with st.spinner("🔄 Running market dispatch scenarios..."):
         all_results, summary_df = run_all_scenarios_cached(plants, scenarios)
-    
+
     if all_results is None or summary_df is None:
         st.error("❌ Failed to run scenarios")
         st.stop()
+
+    # Content key for caches derived from this result set — stable across
+    # reruns, unlike the identity of the unpickled copies cache_data returns
+    results_key = _inputs_key(plants, scenarios)
     
     # ===== MODE 1: INTERACTIVE ANALYSIS =====
     
@@ -425,7 +653,7 @@ Data/
         scenario_names = scenarios['Scenario_Name'].tolist()
         selected_scenario = st.sidebar.selectbox("Select Scenario", scenario_names, index=0)
         
-        scenario_data = scenarios[scenarios['Scenario_Name'] == selected_scenario].iloc[0]
+        scenario_data = scenarios.loc[selected_scenario]
         
         # Scenario parameters
         st.sidebar.markdown("### 📋 Scenario Parameters")
@@ -435,7 +663,7 @@ Data/
         st.sidebar.metric("Solar Availability", f"{scenario_data['Solar_Availability_Percent']:.0f}%")
         
         # Get results for selected scenario
-        result = next((r for r in all_results if r['scenario_name'] == selected_scenario), None)
+        result = _results_by_name(results_key, all_results).get(selected_scenario)
         
         if result:
             # KPIs
@@ -490,24 +718,34 @@ Data/
             
             with col_a:
                 st.subheader("📈 Interactive Merit Order Curve")
-                merit_fig = create_interactive_merit_order(
+                merit_fig = _cached_merit_fig(
+                    selected_scenario,
+                    _dispatch_hash(result['dispatch_df']),
                     result['dispatch_df'],
                     result['demand_mw'],
-                    result['market_price_eur_mwh'],
-                    selected_scenario
+                    result['market_price_eur_mwh']
                 )
-                st.plotly_chart(merit_fig, use_container_width=True)
+                st.plotly_chart(merit_fig, use_container_width=True,
+                                key='merit_order', theme=None)
                 st.info(f"**Marginal Plant:** {result['marginal_plant_name']} ({result['marginal_technology']})")
             
             with col_b:
                 st.subheader("🥧 Generation Mix")
-                pie_fig = create_interactive_generation_mix(result, selected_scenario)
-                st.plotly_chart(pie_fig, use_container_width=True)
+                gen_mix_hash = hashlib.md5(
+                    repr(sorted(result['generation_by_technology'].items())).encode()
+                ).hexdigest()
+                pie_fig = _cached_generation_mix_fig(selected_scenario, gen_mix_hash, result)
+                st.plotly_chart(pie_fig, use_container_width=True,
+                                key='generation_mix', theme=None)
                 
-                # Generation table
-                gen_df = pd.DataFrame(list(result['generation_by_technology'].items()),
-                                     columns=['Technology', 'Generation (MW)'])
-                gen_df['Share (%)'] = (gen_df['Generation (MW)'] / result['demand_mw'] * 100).round(1)
+                # Generation table — columnar construction, no tuple list
+                gen_by_tech = result['generation_by_technology']
+                gens = np.fromiter(gen_by_tech.values(), dtype=np.float64, count=len(gen_by_tech))
+                gen_df = pd.DataFrame({
+                    'Technology': pd.Categorical(list(gen_by_tech)),
+                    'Generation (MW)': gens,
+                    'Share (%)': np.round(gens / result['demand_mw'] * 100, 1),
+                })
                 st.dataframe(gen_df, hide_index=True, use_container_width=True)
     
     # ===== MODE 2: STATIC REPORTS =====
@@ -524,7 +762,7 @@ Data/
             st.write(f"**Exists:** {os.path.exists(charts_path)}")
             if os.path.exists(charts_path):
                 try:
-                    files = os.listdir(charts_path)
+                    files = sorted(_chart_files(charts_path))
                     st.write(f"**Files found:** {len(files)}")
                     if files:
                         st.write("**File list:**")
@@ -535,24 +773,27 @@ Data/
                 except Exception as e:
                     st.error(f"Error listing files: {e}")
         
-        # Generate charts if needed
-        with st.spinner("🔄 Generating visualization reports..."):
-            charts_generated = generate_all_charts(all_results, summary_df, plants)
-        
-        if not charts_generated:
-            st.warning("⚠️ Some charts may not be available")
+        # Generate charts if needed (in the background — the page stays usable
+        # and fills in as each report finishes rendering)
+        chart_future = _chart_prewarm(results_key, all_results, summary_df, plants)
+        if not chart_future.done():
+            _chart_files.clear()  # re-scan the directory while charts appear
+            st.info("🔄 Visualization reports are rendering in the background — refresh to see new charts.")
+            st.button("🔄 Refresh")
+        elif chart_future.exception() is not None:
+            st.warning(f"⚠️ Some charts may not be available: {chart_future.exception()}")
         
         # Helper function to safely display images
         def safe_display_image(image_path, caption, use_container_width=False):
             """Safely display image with proper error handling"""
             try:
-                if os.path.exists(image_path):
-                    # Method 1: Try direct path first (most compatible)
+                if os.path.basename(image_path) in _chart_files(charts_path):
+                    # Method 1: Cached bytes first (skips disk read on reruns)
                     try:
                         if use_container_width:
-                            st.image(image_path, caption=caption, use_column_width=True)
+                            st.image(_load_png(image_path), caption=caption, use_column_width=True)
                         else:
-                            st.image(image_path, caption=caption)
+                            st.image(_load_png(image_path), caption=caption)
                     except Exception as direct_error:
                         # Method 2: Try with PIL if direct path fails
                         try:
@@ -614,34 +855,31 @@ Data/
         
         st.header("📋 Comprehensive Data Analysis")
         
-        # Summary statistics
+        # One content hash keys every cached artifact derived from summary_df
+        summary_hash = pd.util.hash_pandas_object(summary_df, index=False).sum()
+
+        # Summary statistics (single cached agg pass over summary_df)
+        insights = _summary_insights(summary_hash, summary_df)
         col1, col2, col3, col4 = st.columns(4)
         col1.metric("Total Scenarios", len(summary_df))
-        col2.metric("Avg Market Price", f"€{summary_df['Market_Price_EUR_MWh'].mean():.2f}/MWh")
-        col3.metric("Avg Renewable Share", f"{summary_df['Renewable_Share_%'].mean():.1f}%")
-        col4.metric("Total CO₂ Emissions", f"{summary_df['Total_Emissions_tons'].sum():,.0f} tons")
+        col2.metric("Avg Market Price", f"€{insights['avg_price']:.2f}/MWh")
+        col3.metric("Avg Renewable Share", f"{insights['avg_renewable']:.1f}%")
+        col4.metric("Total CO₂ Emissions", f"{insights['total_emissions']:,.0f} tons")
         
         st.markdown("---")
         
         # Full data table
         st.subheader("📊 Complete Scenario Results")
         
-        # Format the dataframe
-        display_df = summary_df.copy()
+        # Format the dataframe (cached Styler, keeps st.dataframe interactivity)
         st.dataframe(
-            display_df.style.format({
-                'Market_Price_EUR_MWh': '€{:.2f}',
-                'Renewable_Share_%': '{:.1f}%',
-                'Total_Emissions_tons': '{:,.0f}',
-                'Carbon_Intensity_g_kWh': '{:.1f}',
-                'Producer_Surplus_EUR': '€{:,.0f}'
-            }),
+            _styled_summary(summary_hash, summary_df),
             use_container_width=True,
             height=400
         )
-        
+
         # Download button
-        csv = summary_df.to_csv(index=False)
+        csv = _csv_bytes(summary_hash, summary_df)
         st.download_button(
             label="📥 Download Complete Results (CSV)",
             data=csv,
@@ -651,7 +889,7 @@ Data/
         
         # BI-Ready Export
         bi_ready_df = prepare_bi_export(summary_df)
-        bi_csv = bi_ready_df.to_csv(index=False)
+        bi_csv = _csv_bytes(pd.util.hash_pandas_object(bi_ready_df, index=False).sum(), bi_ready_df)
 
         st.download_button(
           label="📊 Download for Power BI (Long Format)",
@@ -674,23 +912,15 @@ Data/
         
         with col_i1:
             st.markdown("**💰 Price Analysis:**")
-            min_price = summary_df['Market_Price_EUR_MWh'].min()
-            max_price = summary_df['Market_Price_EUR_MWh'].max()
-            min_scenario = summary_df.loc[summary_df['Market_Price_EUR_MWh'].idxmin(), 'Scenario_Name']
-            max_scenario = summary_df.loc[summary_df['Market_Price_EUR_MWh'].idxmax(), 'Scenario_Name']
-            
-            st.write(f"- **Range:** €{min_price:.2f} - €{max_price:.2f}/MWh")
-            st.write(f"- **Lowest:** {min_scenario} (€{min_price:.2f})")
-            st.write(f"- **Highest:** {max_scenario} (€{max_price:.2f})")
-        
+            st.write(f"- **Range:** €{insights['min_price']:.2f} - €{insights['max_price']:.2f}/MWh")
+            st.write(f"- **Lowest:** {insights['min_scenario']} (€{insights['min_price']:.2f})")
+            st.write(f"- **Highest:** {insights['max_scenario']} (€{insights['max_price']:.2f})")
+
         with col_i2:
             st.markdown("**♻️ Renewable Energy:**")
-            avg_renewable = summary_df['Renewable_Share_%'].mean()
-            max_renewable = summary_df['Renewable_Share_%'].max()
-            
-            st.write(f"- **Average Share:** {avg_renewable:.1f}%")
-            st.write(f"- **Maximum Share:** {max_renewable:.1f}%")
-            st.write(f"- **Scenarios with 100% RE:** {len(summary_df[summary_df['Renewable_Share_%'] == 100])}")
+            st.write(f"- **Average Share:** {insights['avg_renewable']:.1f}%")
+            st.write(f"- **Maximum Share:** {insights['max_renewable']:.1f}%")
+            st.write(f"- **Scenarios with 100% RE:** {insights['n_full_renewable']}")
     
     # Enhanced Footer
     st.markdown("---")